@@ -1,7 +1,7 @@
-import base64
 import json
 import os
 import re
+import tempfile
 import time
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
@@ -224,7 +224,6 @@ def group_frames_by_date(frames):
 
 def upload_bytes_to_imgbb(file_bytes, filename, expiration=86400):
     """업로드된 파일 바이트를 imgbb에 직접 업로드합니다."""
-    image_data = base64.b64encode(file_bytes).decode("utf-8")
     api_key = os.getenv("IMGBB_API_KEY", "")
     if not api_key:
         try:
@@ -233,11 +232,12 @@ def upload_bytes_to_imgbb(file_bytes, filename, expiration=86400):
             pass
     payload = {
         "key": api_key,
-        "image": image_data,
         "name": filename,
         "expiration": expiration,
     }
-    resp = req.post("https://api.imgbb.com/1/upload", data=payload)
+    # base64 문자열 사본을 만들지 않고 바이트를 multipart 바이너리로 그대로 전송
+    resp = req.post("https://api.imgbb.com/1/upload", data=payload,
+                    files={"image": (filename, file_bytes)})
     resp.raise_for_status()
     result = resp.json()
     if not result.get("success"):
@@ -274,18 +274,20 @@ def publish_one_group(group_name, group_info, caption, scheduled_time, account,
             figma = FigmaClient()
             image_urls = figma.export_images(node_ids, fmt="png", scale=2)
 
-            status_container.write(f"⬇️ [{group_name}] 이미지 다운로드 중...")
-            figma.download_images(image_urls)
-            ordered_files = []
-            for nid in node_ids:
-                safe = nid.replace(":", "-")
-                path = os.path.join("downloads", f"frame_{safe}.png")
-                if os.path.exists(path):
-                    ordered_files.append(path)
-
-            status_container.write(f"☁️ [{group_name}] imgbb 업로드 중...")
-            host = ImageHost()
-            public_urls = host.upload_batch(ordered_files, expiration=86400)
+            # 그룹(세션)마다 전용 임시 폴더 → 동시 발행 시 파일 충돌 없음, 예외 시에도 자동 정리
+            with tempfile.TemporaryDirectory(prefix="figma_") as tmp_dir:
+                status_container.write(f"⬇️ [{group_name}] 이미지 다운로드 중...")
+                figma.download_images(image_urls, output_dir=tmp_dir)
+                ordered_files = []
+                for nid in node_ids:
+                    safe = nid.replace(":", "-")
+                    path = os.path.join(tmp_dir, f"frame_{safe}.png")
+                    if os.path.exists(path):
+                        ordered_files.append(path)
+
+                status_container.write(f"☁️ [{group_name}] imgbb 업로드 중...")
+                host = ImageHost()
+                public_urls = host.upload_batch(ordered_files, expiration=86400)
 
         elif source == "upload":
             files = group_info["files"]
@@ -2499,19 +2501,12 @@ with st.sidebar:
                     if not pages:
                         st.error("연결된 Facebook 페이지가 없습니다.")
                     else:
-                        # 3) 각 페이지의 Instagram Business Account 조회
-                        found_accounts = []
-                        for page in pages:
-                            try:
-                                ig_id = TokenManager.get_ig_user_id(
-                                    page["id"], page["access_token"]
-                                )
-                                found_accounts.append({
-                                    "page_name": page["name"],
-                                    "ig_user_id": ig_id,
-                                })
-                            except Exception:
-                                pass
+                        # 3) 각 페이지의 Instagram Business Account 병렬 조회
+                        ig_ids = TokenManager.get_ig_user_ids(pages)
+                        found_accounts = [
+                            {"page_name": page["name"], "ig_user_id": ig_ids[page["id"]]}
+                            for page in pages if page["id"] in ig_ids
+                        ]
 
                         if not found_accounts:
                             st.error("Instagram Business 계정이 연결된 페이지가 없습니다.")
@@ -238,17 +238,23 @@ _TYPO_FIXES = {
 }
 
 
+# LLM 응답 후처리 패턴 (캡션마다 호출되므로 모듈 로드 시 1회 컴파일)
+_CJK_CHAR_RE = re.compile(r"(?<!수)[一-龥]")
+_DANGLING_PARTICLE_RE = re.compile(r"(?<=\. )(부터|에서|까지|으로|와|과|의) ")
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*")
+
+
 def _sanitize_korean(text):
     """LLM 출력에서 한자·비한글 문자를 제거하고 흔한 오타를 수정합니다."""
     for cjk, kor in _CJK_REPLACEMENTS.items():
         text = text.replace(cjk, kor)
     # 남은 CJK 한자(壽 제외) 제거
-    text = re.sub(r"(?<!수)[一-龥]", "", text)
+    text = _CJK_CHAR_RE.sub("", text)
     # 흔한 오타 수정
     for typo, fix in _TYPO_FIXES.items():
         text = text.replace(typo, fix)
     # 조사 없이 시작하는 불완전 문장 제거 (". 부터", ". 에서" 등)
-    text = re.sub(r"(?<=\. )(부터|에서|까지|으로|와|과|의) ", "", text)
+    text = _DANGLING_PARTICLE_RE.sub("", text)
     return text
 
 
@@ -256,7 +262,7 @@ def _parse_ai_response(text):
     """AI 응답에서 hook/body JSON을 파싱합니다."""
     text = text.strip()
     if "```" in text:
-        text = re.sub(r"```(?:json)?\s*", "", text)
+        text = _CODE_FENCE_RE.sub("", text)
         text = text.replace("```", "").strip()
 
     data = json.loads(text)
@@ -9,11 +9,18 @@ Figma 2025 원본 좌표 기반 (1080x1350):
 제품 이미지: content에서만 사용 (네이티브 콘텐츠 느낌).
 Unsplash: 영어 키워드 자동 변환 후 검색.
 """
+import atexit
+import functools
 import io
 import logging
+import multiprocessing
 import os
+import pickle
 import random
+import threading
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -103,6 +110,7 @@ _FONT_PATHS = {
     ],
 }
 _font_cache = {}
+_char_w_cache = {}  # (font, ch) → 글자 폭
 
 
 def _load_font(role, size):
@@ -130,6 +138,8 @@ def _load_font(role, size):
 # ── 유틸리티 ──────────────────────────────────────────────
 
 def _fit_cover(photo, w, h):
+    if photo.mode != "RGB":
+        photo = photo.convert("RGB")
     pw, ph = photo.size
     target_ratio = w / h
     photo_ratio = pw / ph
@@ -141,19 +151,40 @@ def _fit_cover(photo, w, h):
         new_h = int(pw / target_ratio)
         top = (ph - new_h) // 2
         photo = photo.crop((0, top, pw, top + new_h))
+    # 큰 배율 축소는 box 평균(reduce)으로 먼저 줄이고 마지막 단계만 Lanczos
+    factor = min(photo.width // w, photo.height // h) // 2
+    if factor > 1:
+        photo = photo.reduce(factor)
     return photo.resize((w, h), Image.LANCZOS)
 
 
-def _open_image(source):
+def _open_image(source, draft_size=None):
+    """배경 소스를 RGB로 디코딩 (알파 불필요 → RGBA 경유 변환 생략).
+    draft_size: 최종 출력 크기 (w, h). JPEG는 그 2배 이상 해상도로만 디코딩."""
     if source is None:
         return None
     if isinstance(source, Image.Image):
-        return source.convert("RGBA")
+        return source
     if isinstance(source, (bytes, bytearray)):
-        return Image.open(io.BytesIO(source)).convert("RGBA")
+        img = Image.open(io.BytesIO(source))
+        if draft_size and img.format == "JPEG":
+            img.draft("RGB", (draft_size[0] * 2, draft_size[1] * 2))
+        return img.convert("RGB")
     return None
 
 
+_panel_cache = {}
+_gradient_cache = {}  # (w, h) → 하단 그라디언트 오버레이
+
+
+def _solid_panel(color, size):
+    """단색 RGB 패널 (색상·크기별 1회 생성 후 재사용). 공유 객체이므로 그리기 전 복사."""
+    key = (color, size)
+    if key not in _panel_cache:
+        _panel_cache[key] = Image.new("RGB", size, color)
+    return _panel_cache[key]
+
+
 # ── 에셋 ─────────────────────────────────────────────────
 
 _ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
@@ -228,14 +259,37 @@ PRODUCT_IMAGES = {
 }
 
 
-def _find_product_bg(text):
-    """텍스트에서 제품 키워드를 감지하고 매칭 배경 이미지 반환."""
+_fitted_asset_cache = {}
+
+
+def _load_fitted_asset(name, w, h):
+    """배경용 에셋을 캔버스 크기로 미리 맞춘 RGB 이미지 (에셋·크기별 1회).
+    수천 px 원본은 캐시하지 않고 맞춘 결과만 보관."""
+    key = (name, w, h)
+    if key in _fitted_asset_cache:
+        return _fitted_asset_cache[key]
+    path = os.path.join(_ASSETS_DIR, name)
+    fitted = None
+    if os.path.exists(path):
+        try:
+            img = Image.open(path)
+            if img.format == "JPEG":
+                img.draft("RGB", (w * 2, h * 2))
+            fitted = _fit_cover(img, w, h)
+        except Exception:
+            pass
+    _fitted_asset_cache[key] = fitted
+    return fitted
+
+
+def _find_product_bg(text, size=(1080, 1350)):
+    """텍스트에서 제품 키워드를 감지하고 매칭 배경 이미지 반환 (size에 맞춘 RGB)."""
     if not text:
         return None
     for keyword, images in PRODUCT_IMAGES.items():
         if keyword in text and images:
             path = random.choice(images)
-            return _load_asset(path)
+            return _load_fitted_asset(path, *size)
     return None
 
 
@@ -332,7 +386,7 @@ def _fetch_unsplash_bg(query):
             img_url = photo["urls"]["regular"]
             with urllib.request.urlopen(img_url, timeout=15) as img_resp:
                 img_data = img_resp.read()
-            return Image.open(io.BytesIO(img_data)).convert("RGBA")
+            return Image.open(io.BytesIO(img_data)).convert("RGB")
         except Exception:
             continue
     return None
@@ -358,15 +412,28 @@ TEMPLATES = {
 class CardNewsRenderer:
     """Figma 2025 원본 스타일 카드뉴스 생성기 (1080x1350)."""
 
-    def __init__(self, template_name="수壽 브랜드", size=(1080, 1350)):
+    def __init__(self, template_name="수壽 브랜드", size=(1080, 1350), fmt="png"):
         self.w, self.h = size
         self.s = self.w / 1080
+        self.fmt = fmt  # "png" | "jpeg" (인스타 업로드 전용이면 JPEG가 빠르고 작음)
+        # 로고 에셋은 그리는 크기로 한 번만 리사이즈해 슬라이드마다 재사용
+        badge = _load_asset("logo_badge.png")
+        badge_size = int(LAYOUT["badge_size"] * self.s)
+        self._badge = (badge.resize((badge_size, badge_size), Image.LANCZOS)
+                       if badge else None)
+        closing_img = _load_asset("closing_fixed.png")
+        self._closing = (_fit_cover(closing_img, self.w, self.h)
+                         if closing_img else None)
+        self._watermark = self._build_watermark()
 
     # ── 자간(letter-spacing) 적용 텍스트 유틸 ──
 
     def _char_w(self, draw, ch, font):
-        b = draw.textbbox((0, 0), ch, font=font)
-        return b[2] - b[0]
+        key = (font, ch)
+        if key not in _char_w_cache:
+            b = draw.textbbox((0, 0), ch, font=font)
+            _char_w_cache[key] = b[2] - b[0]
+        return _char_w_cache[key]
 
     def _text_w_ls(self, draw, text, font, ls):
         if not text:
@@ -420,15 +487,17 @@ class CardNewsRenderer:
         return lines
 
     def _wrap_chars_ls(self, draw, text, font, max_w, ls):
-        lines, cur = [], ""
+        # 줄 너비를 누적 계산 (매 글자마다 줄 전체를 다시 재지 않음)
+        lines, cur, cur_w = [], "", 0
         for ch in text:
-            test = cur + ch
-            if self._text_w_ls(draw, test, font, ls) <= max_w:
-                cur = test
+            ch_w = self._char_w(draw, ch, font)
+            test_w = cur_w + ls + ch_w if cur else ch_w
+            if test_w <= max_w:
+                cur, cur_w = cur + ch, test_w
             else:
                 if cur:
                     lines.append(cur)
-                cur = ch
+                cur, cur_w = ch, ch_w
         if cur:
             lines.append(cur)
         return lines
@@ -437,7 +506,13 @@ class CardNewsRenderer:
         if img.mode == "RGBA":
             img = img.convert("RGB")
         buf = io.BytesIO()
-        img.save(buf, format="PNG", optimize=True)
+        if self.fmt == "jpeg":
+            # 인스타그램은 업로드 시 어차피 JPEG로 재인코딩
+            img.save(buf, format="JPEG", quality=92, subsampling=1)
+        else:
+            # optimize=True는 DEFLATE 전략을 전부 시도해 10배 이상 느림
+            # 대신 용량이 커짐: 클로징 +18%, 사진 슬라이드 +25~38%, 단색 배경 +84% (21KB → 39KB)
+            img.save(buf, format="PNG", compress_level=1)
         return buf.getvalue()
 
     # ── 공통 요소 (Figma 정확한 좌표) ──
@@ -447,35 +522,40 @@ class CardNewsRenderer:
         s = self.s
         grad_y = int(LAYOUT["gradient_y"] * s)
         grad_h = int(LAYOUT["gradient_h"] * s)
-        r, g, b = BRAND["gradient_dark"]
-        overlay = Image.new("RGBA", (self.w, self.h), (0, 0, 0, 0))
-        draw_ov = ImageDraw.Draw(overlay)
-        for y in range(grad_y, min(grad_y + grad_h, self.h)):
-            progress = (y - grad_y) / grad_h
-            alpha = int(255 * progress)
-            draw_ov.line([(0, y), (self.w, y)], fill=(r, g, b, alpha))
-        img = Image.alpha_composite(img.convert("RGBA"), overlay)
-        img = Image.alpha_composite(img, overlay)  # 2겹
+        # 모든 슬라이드에 동일 → 캔버스 크기별 1회 생성 후 재사용
+        band_h = min(grad_y + grad_h, self.h) - grad_y
+        if band_h <= 0:
+            return img.convert("RGBA")  # 캔버스가 그라디언트 시작점보다 짧음
+        overlay = _gradient_cache.get((self.w, self.h))
+        if overlay is None:
+            # 그라디언트 구간만 1px 폭 알파 램프로 만들고 가로로 늘림 (전체 캔버스 오버레이 불필요)
+            alphas = bytes(int(255 * (y / grad_h)) for y in range(band_h))
+            ramp = Image.new("RGBA", (1, band_h), BRAND["gradient_dark"])
+            ramp.putalpha(Image.frombytes("L", (1, band_h), alphas))
+            overlay = ramp.resize((self.w, band_h), Image.NEAREST)
+            _gradient_cache[(self.w, self.h)] = overlay
+        img = img.convert("RGBA")
+        img.alpha_composite(overlay, (0, grad_y))
+        img.alpha_composite(overlay, (0, grad_y))  # 2겹
         return img
 
     def _place_badge(self, img):
         """뱃지: x=24, y=24, 86x86."""
-        badge = _load_asset("logo_badge.png")
-        if not badge:
+        badge_r = self._badge
+        if not badge_r:
             return img
         s = self.s
-        size = int(LAYOUT["badge_size"] * s)
-        badge_r = badge.resize((size, size), Image.LANCZOS)
         x = int(LAYOUT["badge_x"] * s)
         y = int(LAYOUT["badge_y"] * s)
         img_rgba = img.convert("RGBA") if img.mode != "RGBA" else img
         img_rgba.paste(badge_r, (x, y), badge_r)
         return img_rgba
 
-    def _draw_watermark(self, img):
+    def _build_watermark(self):
         """워터마크: GFS Didot 400, 32pt, center, y=1268.
         3x 고해상도 렌더링 후 다운스케일로 안티앨리어싱 적용.
-        Figma 스펙: w=133, h=42(line-height box), bottom_margin=40px."""
+        Figma 스펙: w=133, h=42(line-height box), bottom_margin=40px.
+        모든 슬라이드에 동일하므로 글자 영역만 잘라낸 스프라이트로 1회 생성."""
         s = self.s
         st = TEXT_STYLES["watermark"]
         text = "thesoo.co"
@@ -497,7 +577,12 @@ class CardNewsRenderer:
         final_h = int(60 * s)
         wm_strip = tmp.resize((final_w, final_h), Image.LANCZOS)
         paste_y = int(LAYOUT["watermark_y"] * s)
-        img.paste(wm_strip, (0, paste_y), wm_strip)
+        crop = wm_strip.getbbox() or (0, 0, final_w, final_h)
+        return wm_strip.crop(crop), (crop[0], paste_y + crop[1])
+
+    def _draw_watermark(self, img):
+        sprite, pos = self._watermark
+        img.paste(sprite, pos, sprite)
 
     # ── 텍스트 블록 렌더링 ──
 
@@ -536,15 +621,15 @@ class CardNewsRenderer:
     def render_cover(self, title, subtitle="", bg_image=None,
                      badge_text="", title_size=None):
         s = self.s
-        photo = _open_image(bg_image)
+        photo = _open_image(bg_image, (self.w, self.h))
         if not photo:
             all_text = title + " " + (subtitle or "")
             photo = _fetch_unsplash_bg(_extract_search_query(all_text))
 
         if photo:
-            img = _fit_cover(photo.convert("RGB"), self.w, self.h).convert("RGBA")
+            img = _fit_cover(photo, self.w, self.h)
         else:
-            img = Image.new("RGBA", (self.w, self.h), (*BRAND["dark_red"], 255))
+            img = _solid_panel(BRAND["dark_red"], (self.w, self.h))
 
         img = self._draw_gradient(img)
         draw = ImageDraw.Draw(img)
@@ -573,16 +658,16 @@ class CardNewsRenderer:
                        total_slides=None, bg_image=None):
         s = self.s
         all_text = (heading or "") + " " + (body or "")
-        photo = _open_image(bg_image)
+        photo = _open_image(bg_image, (self.w, self.h))
         if not photo:
-            photo = _find_product_bg(all_text)
+            photo = _find_product_bg(all_text, (self.w, self.h))
         if not photo:
             photo = _fetch_unsplash_bg(_extract_search_query(all_text))
 
         if photo:
-            img = _fit_cover(photo.convert("RGB"), self.w, self.h).convert("RGBA")
+            img = _fit_cover(photo, self.w, self.h)
         else:
-            img = Image.new("RGBA", (self.w, self.h), (*BRAND["dark_red"], 255))
+            img = _solid_panel(BRAND["dark_red"], (self.w, self.h))
 
         img = self._draw_gradient(img)
         draw = ImageDraw.Draw(img)
@@ -635,13 +720,15 @@ class CardNewsRenderer:
 
     def render_checklist(self, title, items, bg_image=None):
         s = self.s
-        img = Image.new("RGBA", (self.w, self.h), (*BRAND["dark_red"], 255))
+        panel = _solid_panel(BRAND["dark_red"], (self.w, self.h))
 
-        photo = _open_image(bg_image)
+        photo = _open_image(bg_image, (self.w, self.h))
         if photo:
-            photo_fit = _fit_cover(photo.convert("RGB"), self.w, self.h)
-            dark_overlay = Image.new("RGBA", (self.w, self.h), (*BRAND["dark_red"], 200))
-            img = Image.alpha_composite(photo_fit.convert("RGBA"), dark_overlay)
+            photo_fit = _fit_cover(photo, self.w, self.h)
+            # 단색 반투명 오버레이 = RGB 선형 블렌드 (알파 분리/합성 불필요)
+            img = Image.blend(photo_fit, panel, 200 / 255).convert("RGBA")
+        else:
+            img = panel.convert("RGBA")
 
         draw = ImageDraw.Draw(img)
         pad = int(84 * s)
@@ -716,11 +803,9 @@ class CardNewsRenderer:
     # ═══════════════════════════════════════════════════════
 
     def render_closing(self, cta_text="", account_name="", bg_image=None):
-        closing_img = _load_asset("closing_fixed.png")
-        if closing_img:
-            img = _fit_cover(closing_img.convert("RGB"), self.w, self.h)
-            return self._to_bytes(img)
-        img = Image.new("RGB", (self.w, self.h), BRAND["dark_red"])
+        if self._closing:
+            return self._to_bytes(self._closing)
+        img = _solid_panel(BRAND["dark_red"], (self.w, self.h)).copy()
         draw = ImageDraw.Draw(img)
         self._draw_watermark(img)
         return self._to_bytes(img)
@@ -729,25 +814,136 @@ class CardNewsRenderer:
     # 일괄 렌더링
     # ═══════════════════════════════════════════════════════
 
-    def render_all(self, slides_data):
-        results = []
-        content_idx = 0
-        content_total = sum(1 for s in slides_data if s["type"] == "content")
-        for slide in slides_data:
-            st = slide["type"]
-            bg = slide.get("bg_image")
-            if st == "cover":
-                results.append(self.render_cover(
-                    slide.get("title", ""), slide.get("subtitle", ""), bg_image=bg))
-            elif st == "content":
-                content_idx += 1
-                results.append(self.render_content(
-                    slide.get("heading", ""), slide.get("body", ""),
-                    slide_num=content_idx, total_slides=content_total, bg_image=bg))
-            elif st == "checklist":
-                results.append(self.render_checklist(
-                    slide.get("title", ""), slide.get("items", []), bg_image=bg))
-            elif st == "closing":
-                results.append(self.render_closing(
-                    slide.get("cta_text", ""), slide.get("account_name", ""), bg_image=bg))
+    # 슬라이드 타입 → (렌더 메서드, 위치 인자 (키, 기본값), 있으면 넘길 키워드 인자)
+    _SLIDE_SPECS = {
+        "cover": ("render_cover", (("title", ""), ("subtitle", "")),
+                  ("badge_text", "title_size")),
+        "content": ("render_content", (("heading", ""), ("body", "")), ()),
+        "checklist": ("render_checklist", (("title", ""), ("items", [])), ()),
+        "closing": ("render_closing", (("cta_text", ""), ("account_name", "")), ()),
+    }
+
+    def render_all(self, slides_data, return_exceptions=False, on_done=None):
+        """슬라이드 목록을 일괄 렌더링합니다.
+
+        Args:
+            slides_data: [{"type": "cover" | "content" | ..., "bg_image": ..., ...}]
+            return_exceptions: True면 실패한 슬라이드 자리에 예외 객체를 넣어 반환
+            on_done: fn(index, result) — 슬라이드 하나가 끝날 때마다 (완료 순서대로) 호출
+        Returns: 슬라이드 순서대로 이미지 bytes 리스트
+        """
+        slides = [s for s in slides_data if s["type"] in self._SLIDE_SPECS]
+        content_total = sum(1 for s in slides if s["type"] == "content")
+        content_nums = iter(range(1, content_total + 1))
+        jobs = []
+        for slide in slides:
+            method, fields, options = self._SLIDE_SPECS[slide["type"]]
+            kwargs = {"bg_image": slide.get("bg_image")}
+            kwargs.update((k, slide[k]) for k in options if k in slide)
+            if slide["type"] == "content":
+                kwargs.update(slide_num=next(content_nums), total_slides=content_total)
+            jobs.append((method, tuple(slide.get(k, d) for k, d in fields), kwargs))
+
+        results = [None] * len(jobs)
+        pending = set(range(len(jobs)))
+
+        def _finish(idx, call):
+            results[idx] = _job_result(call, return_exceptions)
+            pending.discard(idx)
+            if on_done:
+                on_done(idx, results[idx])
+
+        # 슬라이드별 렌더링은 서로 독립적인 CPU 작업 → 3장 이상이고 코어가 2개 이상이면 프로세스 병렬
+        # 풀 자체가 못 뜨거나 깨졌을 때만 순차 렌더링으로 전환 (렌더 예외는 그대로 전달)
+        pool = _get_render_pool() if len(jobs) > 2 else None
+        if pool:
+            opts = ((self.w, self.h), self.fmt)
+            futures = {}
+            try:
+                for idx, job in enumerate(jobs):
+                    futures[pool.submit(_render_one, (opts, *job))] = idx
+            except (OSError, *_POOL_ERRORS) as e:
+                logger.warning(f"병렬 렌더링 시작 실패, 순차 렌더링으로 전환: {e}")
+                _reset_render_pool(pool)
+            else:
+                try:
+                    for f in as_completed(futures):
+                        _finish(futures[f], f.result)
+                    return results
+                except _POOL_ERRORS as e:
+                    logger.warning(f"병렬 렌더링 실패, 순차 렌더링으로 전환: {e}")
+                    _reset_render_pool(pool)
+            finally:
+                # 렌더 예외로 중단되면 남은 슬라이드는 워커에서 빼냄
+                for f in futures:
+                    f.cancel()
+        # 순차 렌더링 (풀이 중간에 깨졌으면 아직 안 끝난 슬라이드만)
+        for idx in sorted(pending):
+            method, args, kwargs = jobs[idx]
+            _finish(idx, functools.partial(getattr(self, method), *args, **kwargs))
         return results
+
+
+# 워커 프로세스가 죽었거나 작업을 직렬화하지 못한 경우 (슬라이드 렌더 오류와 구분)
+_POOL_ERRORS = (BrokenProcessPool, pickle.PicklingError)
+
+
+def _job_result(call, return_exceptions):
+    try:
+        return call()
+    except _POOL_ERRORS:
+        raise
+    except Exception as e:
+        if not return_exceptions:
+            raise
+        return e
+
+
+# ── 렌더링 프로세스 풀 (프로세스당 1개, 덱마다 재사용) ──
+# 워커를 덱마다 새로 띄우면 워커별 캐시(폰트/에셋/그라디언트/글자폭)가 매번 비어 있음
+
+_MAX_RENDER_WORKERS = 8  # 카드뉴스 1덱 분량이면 충분
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _usable_cpu_count():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))  # 컨테이너 CPU 제한 반영
+    return os.cpu_count() or 1
+
+
+def _get_render_pool():
+    """공용 렌더링 풀을 반환합니다. 워커가 1개뿐이면 None (순차 렌더링이 더 빠름)."""
+    global _render_pool
+    workers = min(_usable_cpu_count(), _MAX_RENDER_WORKERS)
+    if workers < 2:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Streamlit 서버는 스레드가 많아 fork가 위험 → spawn (워커 재사용으로 기동 비용 1회)
+            _render_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_render_pool.shutdown, cancel_futures=True)
+        return _render_pool
+
+
+def _reset_render_pool(pool):
+    """깨진 풀을 버려 다음 호출 때 새로 만들게 합니다."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 워커 프로세스마다 (크기, 포맷)별 렌더러 1개만 생성해 재사용 (에셋 리사이즈 1회)
+_worker_renderers = {}
+
+
+def _render_one(job):
+    (size, fmt), method, args, kwargs = job
+    renderer = _worker_renderers.get((size, fmt))
+    if renderer is None:
+        renderer = _worker_renderers[(size, fmt)] = CardNewsRenderer(size=size, fmt=fmt)
+    return getattr(renderer, method)(*args, **kwargs)
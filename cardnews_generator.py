@@ -26,6 +26,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# ── LLM 응답 JSON 추출 패턴 (모듈 로드 시 1회 컴파일) ──
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
+_JSON_FENCED_OBJ_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_FENCED_ARR_RE = re.compile(r"```(?:json)?\s*(\[.*?\])\s*```", re.DOTALL)
+_JSON_FLAT_OBJ_RE = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}")
+
 # ── 히스토리 파일 ──
 HISTORY_FILE = Path(__file__).parent / "cardnews_history.json"
 
@@ -703,7 +710,7 @@ def _convert_trends_to_health(keywords: list[str]) -> dict[str, str]:
     raw = _call_llm(system, user, temperature=0.7, max_tokens=1000)
     if raw:
         try:
-            match = re.search(r"\{[\s\S]*\}", raw)
+            match = _JSON_OBJ_RE.search(raw)
             if match:
                 result = json.loads(match.group(0))
                 for kw, topic in result.items():
@@ -1722,12 +1729,12 @@ def _parse_ideas_json(text: str, limit: int | None = None) -> list[dict]:
         limit: 최대 반환 개수 (None이면 전체 반환)
     """
     # ```json ... ``` 블록 추출
-    match = re.search(r"```(?:json)?\s*(\[[\s\S]*?\])\s*```", text)
+    match = _JSON_FENCED_ARR_RE.search(text)
     if match:
         text = match.group(1)
     else:
         # [ ... ] 패턴 직접 찾기
-        match = re.search(r"\[[\s\S]*\]", text)
+        match = _JSON_ARR_RE.search(text)
         if match:
             text = match.group(0)
 
@@ -1739,7 +1746,7 @@ def _parse_ideas_json(text: str, limit: int | None = None) -> list[dict]:
         pass
 
     # 개별 JSON 객체 추출 시도
-    objects = re.findall(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text)
+    objects = _JSON_FLAT_OBJ_RE.findall(text)
     results = []
     for obj_str in objects[:limit] if limit else objects:
         try:
@@ -2156,11 +2163,11 @@ def generate_full_script(idea: dict, num_content: int = 5) -> dict | None:
         return None
 
     # JSON 파싱
-    match = re.search(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", raw)
+    match = _JSON_FENCED_OBJ_RE.search(raw)
     if match:
         raw = match.group(1)
     else:
-        match = re.search(r"\{[\s\S]*\}", raw)
+        match = _JSON_OBJ_RE.search(raw)
         if match:
             raw = match.group(0)
 
@@ -2372,11 +2379,11 @@ def generate_description_first(idea: dict, num_content: int = 5) -> dict | None:
         return None
 
     # JSON 파싱
-    match = re.search(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", raw)
+    match = _JSON_FENCED_OBJ_RE.search(raw)
     if match:
         raw = match.group(1)
     else:
-        match = re.search(r"\{[\s\S]*\}", raw)
+        match = _JSON_OBJ_RE.search(raw)
         if match:
             raw = match.group(0)
 
@@ -2687,25 +2694,34 @@ def _download_bg_image(img_info: dict, width: int = 1080, height: int = 1440) ->
 
 import re as _re
 
+# 렌더링용 텍스트 정리 패턴 (카드마다 호출되므로 모듈 로드 시 1회 컴파일)
+_MD_PATTERNS = [
+    _re.compile(r'\*\*(.+?)\*\*'),                          # **bold**
+    _re.compile(r'~~(.+?)~~'),                              # ~~strike~~
+    _re.compile(r'__(.+?)__'),                              # __underline__
+    _re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)'),    # *italic*
+    _re.compile(r'`(.+?)`'),                                # `code`
+]
+# 이모지/특수 유니코드 (한글, 영문, 숫자, 기본 문장부호만 보존)
+_NON_TEXT_RE = _re.compile(
+    r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣa-zA-Z0-9'
+    r'.,!?;:%()\-·/~\'"↑↓→←+&@#\n]'
+)
+_MULTI_SPACE_RE = _re.compile(r'  +')
+
+
 def _clean_markdown(text):
     """마크다운 기호 + 이모지/특수문자를 제거하여 렌더링용 순수 텍스트로 변환."""
     if not text:
         return text
     # 마크다운 제거
-    text = _re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # **bold**
-    text = _re.sub(r'~~(.+?)~~', r'\1', text)       # ~~strike~~
-    text = _re.sub(r'__(.+?)__', r'\1', text)       # __underline__
-    text = _re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'\1', text)  # *italic*
-    text = _re.sub(r'`(.+?)`', r'\1', text)         # `code`
+    for pattern in _MD_PATTERNS:
+        text = pattern.sub(r'\1', text)
     text = text.replace('**', '').replace('~~', '').replace('__', '')
-    # 이모지/특수 유니코드 제거 (한글, 영문, 숫자, 기본 문장부호만 보존)
-    text = _re.sub(
-        r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣa-zA-Z0-9'
-        r'.,!?;:%()\-·/~\'"↑↓→←+&@#\n]',
-        '', text
-    )
+    # 이모지/특수 유니코드 제거
+    text = _NON_TEXT_RE.sub('', text)
     # 연속 공백 정리
-    text = _re.sub(r'  +', ' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
     return text.strip()
 
 
@@ -2750,71 +2766,81 @@ def generate_all_card_images(
     labels_map = _build_labels(card_keys)
     active_cards = [(k, i + 1) for i, k in enumerate(card_keys) if script.get(k)]
     total_cards = len(active_cards) + 1  # + closing
-    content_total = sum(1 for k, _ in active_cards if k != "cover")
-
-    results = {}
-    cover_bg_bytes = None  # 클로징 카드에 재사용
-    content_num = 0
 
+    # 제품 키워드 감지 시 Unsplash 대신 제품 이미지 사용 → 해당 카드는 배경 다운로드 불필요
+    _PRODUCT_KW = ("경옥고", "공진단", "총명공진단", "우황청심원", "녹용한약", "녹용", "콜드퀵", "까스퀵")
+    product_bg_keys = set()
+    for key, _ in active_cards:
+        if key == "cover":
+            continue
+        text = script.get(key, "")
+        content_text = str(text) if isinstance(text, str) else f"{text.get('heading', '')} {text.get('body', '')}"
+        if any(kw in content_text for kw in _PRODUCT_KW):
+            product_bg_keys.add(key)
+
+    # 배경 다운로드는 카드끼리 독립적인 네트워크 I/O → 전부 병렬 요청
+    bg_map = {}
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        bg_futures = {
+            key: pool.submit(_download_bg_image, card_images[key], width, height)
+            for key, _ in active_cards
+            if card_images.get(key) and key not in product_bg_keys
+        }
+        try:
+            for key, future in bg_futures.items():
+                bg_map[key] = future.result()
+        finally:
+            # 중간에 끝나면 (rerun 등) 아직 시작 안 한 다운로드는 취소
+            for future in bg_futures.values():
+                future.cancel()
+
+    slides, slide_keys = [], []
     for key, num in active_cards:
         text = script.get(key, "")
-        img_info = card_images.get(key)
-        label = labels_map.get(key, key)
-        if progress_callback:
-            progress_callback(label, "생성 중...")
-
-        bg_bytes = _download_bg_image(img_info, width, height) if img_info else None
-
         try:
-            badge = f"{num}/{total_cards}"
             if key == "cover":
-                cover_bg_bytes = bg_bytes  # 클로징용 저장
                 cover_title = text if isinstance(text, str) else text.get("heading", str(text))
-                cover_title = _clean_markdown(cover_title)
-                image_bytes = renderer.render_cover(
-                    title=cover_title,
-                    bg_image=bg_bytes, badge_text=badge,
-                )
+                slide = {
+                    "type": "cover", "title": _clean_markdown(cover_title),
+                    "badge_text": f"{num}/{total_cards}",
+                }
             else:
-                # content 슬라이드: render_content() 사용
-                content_num += 1
                 heading, body = _split_heading_body(text)
-                # 제품 키워드 감지 시 Unsplash 대신 제품 이미지 사용
-                content_text = str(text) if isinstance(text, str) else f"{text.get('heading', '')} {text.get('body', '')}"
-                _PRODUCT_KW = ("경옥고", "공진단", "총명공진단", "우황청심원", "녹용한약", "녹용", "콜드퀵", "까스퀵")
-                use_product_bg = any(kw in content_text for kw in _PRODUCT_KW)
-                image_bytes = renderer.render_content(
-                    heading=heading, body=body,
-                    slide_num=content_num, total_slides=content_total,
-                    bg_image=None if use_product_bg else bg_bytes,
-                )
+                slide = {"type": "content", "heading": heading, "body": body}
         except Exception as e:
             logger.warning(f"카드 이미지 생성 실패 ({key}): {e}")
-            image_bytes = None
-
-        if image_bytes:
-            results[key] = image_bytes
             if progress_callback:
-                progress_callback(label, "완료")
-        elif progress_callback:
-            progress_callback(label, "실패")
+                progress_callback(labels_map.get(key, key), "실패")
+            continue
+        slide["bg_image"] = bg_map.get(key)
+        slides.append(slide)
+        slide_keys.append(key)
 
     # 클로징 카드 (커버 배경 이미지 재사용)
     closing_label = f"#{total_cards} 클로징"
-    if progress_callback:
-        progress_callback(closing_label, "생성 중...")
-    try:
-        closing = renderer.render_closing(
-            cta_text="더 오래, 더 건강하게.\n한의사가 만드는 한의 브랜드",
-            account_name="@thesoo_official",
-            bg_image=cover_bg_bytes,
-        )
-    except Exception as e:
-        logger.warning(f"클로징 카드 생성 실패: {e}")
-        closing = None
-    if closing:
-        results["closing"] = closing
-    if progress_callback:
-        progress_callback(closing_label, "완료")
+    slides.append({
+        "type": "closing",
+        "cta_text": "더 오래, 더 건강하게.\n한의사가 만드는 한의 브랜드",
+        "account_name": "@thesoo_official",
+        "bg_image": bg_map.get("cover"),
+    })
+    slide_keys.append("closing")
+
+    # 슬라이드 렌더링은 CardNewsRenderer.render_all()이 프로세스 풀로 병렬 처리
+    # (실패한 카드만 건너뛰도록 예외는 슬라이드별로 받고, 진행률은 끝나는 카드마다 갱신)
+    labels_map = {**labels_map, "closing": closing_label}
+
+    def _on_slide_done(idx, image_bytes):
+        if progress_callback:
+            ok = image_bytes and not isinstance(image_bytes, Exception)
+            progress_callback(labels_map.get(slide_keys[idx], slide_keys[idx]), "완료" if ok else "실패")
+
+    results = {}
+    rendered = renderer.render_all(slides, return_exceptions=True, on_done=_on_slide_done)
+    for key, image_bytes in zip(slide_keys, rendered):
+        if isinstance(image_bytes, Exception):
+            logger.warning(f"카드 이미지 생성 실패 ({key}): {image_bytes}")
+        elif image_bytes:
+            results[key] = image_bytes
 
     return results
@@ -1,4 +1,3 @@
-import base64
 import logging
 import requests
 from config import Config
@@ -18,15 +17,13 @@ class ImageHost:
             image_path: 로컬 이미지 파일 경로
             expiration: 자동 삭제까지 초 (기본 24시간)
         """
-        with open(image_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-
         payload = {
             "key": Config.IMGBB_API_KEY,
-            "image": image_data,
             "expiration": expiration,
         }
-        resp = requests.post(self.UPLOAD_URL, data=payload)
+        # base64 문자열로 읽어 들이지 않고 파일 핸들을 multipart 바이너리로 그대로 전송
+        with open(image_path, "rb") as f:
+            resp = requests.post(self.UPLOAD_URL, data=payload, files={"image": f})
         resp.raise_for_status()
         result = resp.json()
 
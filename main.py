@@ -75,19 +75,20 @@ def cmd_setup_token(short_token):
         logger.error("연결된 Facebook 페이지가 없습니다.")
         return
 
+    ig_ids = TokenManager.get_ig_user_ids(pages)
     for page in pages:
         logger.info(f"\n--- 페이지: {page['name']} ---")
         logger.info(f"Page ID: {page['id']}")
         page_token = page["access_token"]
         logger.info(f"Page Token: {page_token[:20]}...")
 
-        try:
-            ig_id = TokenManager.get_ig_user_id(page["id"], page_token)
+        ig_id = ig_ids.get(page["id"])
+        if ig_id:
             logger.info(f"\n.env에 아래 값을 설정하세요:")
             logger.info(f"  INSTAGRAM_USER_ID={ig_id}")
             logger.info(f"  INSTAGRAM_ACCESS_TOKEN={page_token}")
             logger.info(f"  INSTAGRAM_TOKEN_EXPIRY={expiry_date.strftime('%Y-%m-%d')}")
-        except KeyError:
+        else:
             logger.warning(
                 f"  이 페이지에 연결된 Instagram Business 계정이 없습니다."
             )
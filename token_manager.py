@@ -1,6 +1,9 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -9,6 +12,17 @@ logger = logging.getLogger(__name__)
 class TokenManager:
     """Facebook/Instagram 토큰 수명 주기를 관리합니다."""
 
+    # 토큰 교환 → 페이지 조회 → IG ID 조회가 연달아 호출되므로
+    # graph.facebook.com TCP/TLS 연결을 재사용
+    # 일시적 장애(429/5xx)는 백오프 재시도, 멈춘 연결은 타임아웃으로 끊음
+    _session = requests.Session()
+    _session.mount("https://", HTTPAdapter(max_retries=Retry(
+        total=3, backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,  # 마지막 응답은 raise_for_status()가 처리
+    )))
+    _TIMEOUT = (3.05, 10)  # (연결, 읽기) 초
+
     @staticmethod
     def exchange_for_long_lived(short_lived_token):
         """단기 토큰(~1시간)을 장기 토큰(~60일)으로 교환합니다."""
@@ -19,7 +33,7 @@ class TokenManager:
             "client_secret": Config.META_APP_SECRET,
             "fb_exchange_token": short_lived_token,
         }
-        resp = requests.get(url, params=params)
+        resp = TokenManager._session.get(url, params=params, timeout=TokenManager._TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         logger.info(
@@ -35,7 +49,7 @@ class TokenManager:
         """Page Access Token을 조회합니다 (장기 사용자 토큰 기반 시 만료 없음)."""
         url = f"{Config.GRAPH_BASE_URL}/me/accounts"
         params = {"access_token": user_access_token}
-        resp = requests.get(url, params=params)
+        resp = TokenManager._session.get(url, params=params, timeout=TokenManager._TIMEOUT)
         resp.raise_for_status()
         pages = resp.json().get("data", [])
         for page in pages:
@@ -44,18 +58,46 @@ class TokenManager:
 
     @staticmethod
     def get_ig_user_id(page_id, page_access_token):
-        """Facebook 페이지에 연결된 Instagram Business Account ID를 조회합니다."""
+        """Facebook 페이지에 연결된 Instagram Business Account ID를 조회합니다.
+
+        연결된 계정이 없으면 None을 반환합니다.
+        """
         url = f"{Config.GRAPH_BASE_URL}/{page_id}"
         params = {
             "fields": "instagram_business_account",
             "access_token": page_access_token,
         }
-        resp = requests.get(url, params=params)
+        resp = TokenManager._session.get(url, params=params, timeout=TokenManager._TIMEOUT)
         resp.raise_for_status()
-        ig_id = resp.json()["instagram_business_account"]["id"]
-        logger.info(f"  Instagram Business Account ID: {ig_id}")
+        # 미연결 페이지는 키가 없거나 null로 옴
+        ig_id = (resp.json().get("instagram_business_account") or {}).get("id")
+        if ig_id:
+            logger.info(f"  Instagram Business Account ID: {ig_id}")
         return ig_id
 
+    @staticmethod
+    def get_ig_user_ids(pages):
+        """여러 페이지의 Instagram Business Account ID를 병렬 조회합니다.
+
+        Args:
+            pages: get_page_access_token() 결과 (id, access_token 포함)
+        Returns: {page_id: ig_user_id} — IG 계정이 없거나 조회 실패한 페이지는 제외
+        """
+        def _lookup(page):
+            name = page.get("name", page["id"])
+            try:
+                ig_id = TokenManager.get_ig_user_id(page["id"], page["access_token"])
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"  IG 계정 조회 실패 ({name}): {e}")
+                return page["id"], None
+            if not ig_id:
+                logger.info(f"  연결된 Instagram 계정 없음: {name}")
+            return page["id"], ig_id
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = pool.map(_lookup, pages)
+        return {page_id: ig_id for page_id, ig_id in results if ig_id}
+
     @staticmethod
     def refresh_long_lived_token(existing_token):
         """장기 토큰을 갱신합니다 (만료 전에만 가능, 60일 연장)."""
@@ -66,7 +108,7 @@ class TokenManager:
             "client_secret": Config.META_APP_SECRET,
             "fb_exchange_token": existing_token,
         }
-        resp = requests.get(url, params=params)
+        resp = TokenManager._session.get(url, params=params, timeout=TokenManager._TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         expires_in = data.get("expires_in", 5184000)